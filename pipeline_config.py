@@ -169,11 +169,15 @@ class StorageServiceConfig(ServiceConfig):
         self.save_path = "./output/images"
         self.save_format = "jpg"        # jpg/png/bmp
         self.jpeg_quality = 90
+        self.direct_io = False          # 绕过页缓存直接写盘（仅Linux，适合高帧率全量保存）
+        self.write_workers = 0          # 写盘线程数（0=在管道线程中同步写盘，同一磁盘的服务共享线程池）
+                                        # 未完成写入最多为线程数的2倍，超出时管道等待；多线程时数量上限按写入完成顺序淘汰
         
         # 保存策略
         self.save_all_frames = False    # 保存所有帧
         self.save_interval = 100        # 保存间隔（帧）
         self.save_on_detection = True   # 检测到目标时保存
+        self.max_saved_images = 0       # 最多保留图像数（0=不限制，超出后删除最旧图像）
         
         # 数据记录
         self.save_detections = True     # 保存检测结果
@@ -4,6 +4,7 @@
 实现管道-过滤器架构的基础设施
 """
 
+import sys
 import threading
 import queue
 import time
@@ -16,7 +17,11 @@ logger = get_logger("PipelineCore")
 
 
 # ==================== 数据包定义 ====================
-@dataclass
+# Python 3.10+ 使用__slots__存储字段，每帧数据包不再携带实例字典
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class DataPacket:
     """
     管道中传输的数据包
@@ -114,13 +119,13 @@ class Filter(ABC):
             return packet
         
         try:
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()  # 单调时钟，不受系统时间调整影响
             
             # 调用子类实现的处理方法
             result = self.process(packet)
             
             # 记录处理时间
-            duration = (time.time() - start_time) * 1000  # 转换为毫秒
+            duration = (time.perf_counter_ns() - start_ns) * 1e-6  # 转换为毫秒
             if result:
                 result.add_processing_time(self.name, duration)
             
@@ -163,9 +168,17 @@ class Filter(ABC):
         self.error_count = 0
         self.total_processing_time = 0.0
         logger.info(f"[{self.name}] 统计信息已重置")
+    
+    def close(self):
+        """释放过滤器占用的资源（管道停止时调用），默认无操作"""
+        pass
 
 
 # ==================== 管道类 ====================
+# 输入队列中的停止标记，用于唤醒阻塞等待的管道线程
+_STOP = object()
+
+
 class Pipeline:
     """
     管道类
@@ -188,6 +201,11 @@ class Pipeline:
         self.thread = None
         self.packet_id_counter = 0
         
+        # 端到端延迟统计（毫秒）
+        self.completed_count = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        
         logger.info(f"[{self.name}] 管道初始化，缓冲区大小: {buffer_size}")
     
     def add_filter(self, filter_obj: Filter):
@@ -227,8 +245,25 @@ class Pipeline:
             return
         
         self.running = False
+        # 放入停止标记唤醒阻塞等待中的管道线程；队列已满时线程处理完当前数据包后即会退出
+        try:
+            self.input_queue.put_nowait(_STOP)
+        except queue.Full:
+            pass
         if self.thread:
             self.thread.join(timeout=5)
+        
+        # 释放各过滤器资源（如存储服务的写盘线程池）；
+        # 管道线程未能退出时过滤器可能仍在处理中，此时不能释放
+        if self.thread and self.thread.is_alive():
+            logger.warning(f"[{self.name}] 管道线程未在超时时间内退出，跳过关闭过滤器")
+        else:
+            for filter_obj in self.filters:
+                try:
+                    filter_obj.close()
+                except Exception as e:
+                    logger.exception(f"[{self.name}] 关闭过滤器 {filter_obj.name} 异常: {e}")
+        
         logger.info(f"[{self.name}] 管道已停止")
     
     def _run(self):
@@ -237,8 +272,13 @@ class Pipeline:
         
         while self.running:
             try:
-                # 从输入队列获取数据包（超时1秒）
-                packet = self.input_queue.get(timeout=1)
+                # 阻塞等待数据包，由stop()放入的停止标记唤醒
+                packet = self.input_queue.get()
+                if packet is _STOP:
+                    # 上次停止遗留的标记在重新启动后忽略
+                    if not self.running:
+                        break
+                    continue
                 
                 # 依次通过所有过滤器
                 for filter_obj in self.filters:
@@ -248,18 +288,25 @@ class Pipeline:
                 
                 # 将结果放入输出队列
                 if packet is not None:
+                    self._record_latency(packet)
                     try:
                         self.output_queue.put(packet, timeout=1)
                     except queue.Full:
                         logger.warning(f"[{self.name}] 输出队列已满，丢弃数据包")
                 
-            except queue.Empty:
-                continue
             except Exception as e:
                 logger.exception(f"[{self.name}] 管道运行异常: {e}")
         
         logger.info(f"[{self.name}] 管道线程退出")
     
+    def _record_latency(self, packet: DataPacket):
+        """记录数据包从创建（采集）到处理完成的端到端延迟"""
+        latency = (time.time() - packet.timestamp) * 1000  # 转换为毫秒
+        self.completed_count += 1
+        self.total_latency += latency
+        if latency > self.max_latency:
+            self.max_latency = latency
+    
     def put(self, packet: DataPacket, timeout: float = 1.0) -> bool:
         """
         向管道输入数据包
@@ -283,12 +330,14 @@ class Pipeline:
         从管道获取输出数据包
         
         Args:
-            timeout: 超时时间（秒）
+            timeout: 超时时间（秒），小于等于0时不等待
             
         Returns:
             数据包，如果超时返回None
         """
         try:
+            if timeout <= 0:
+                return self.output_queue.get_nowait()
             return self.output_queue.get(timeout=timeout)
         except queue.Empty:
             return None
@@ -313,31 +362,46 @@ class Pipeline:
             "running": self.running,
             "input_queue_size": self.input_queue.qsize(),
             "output_queue_size": self.output_queue.qsize(),
+            "completed_count": self.completed_count,
+            "average_latency": (self.total_latency / self.completed_count
+                                if self.completed_count > 0 else 0),
+            "max_latency": self.max_latency,
             "filters": [f.get_statistics() for f in self.filters]
         }
         return stats
     
-    def print_statistics(self):
-        """打印统计信息"""
+    def format_statistics(self) -> str:
+        """格式化统计信息（多行文本）"""
         stats = self.get_statistics()
         
-        print("\n" + "=" * 60)
-        print(f"管道统计: {stats['name']}")
-        print("=" * 60)
-        print(f"运行状态: {'运行中' if stats['running'] else '已停止'}")
-        print(f"输入队列: {stats['input_queue_size']}")
-        print(f"输出队列: {stats['output_queue_size']}")
-        
-        print("\n过滤器统计:")
+        lines = [
+            "=" * 60,
+            f"管道统计: {stats['name']}",
+            "=" * 60,
+            f"运行状态: {'运行中' if stats['running'] else '已停止'}",
+            f"输入队列: {stats['input_queue_size']}",
+            f"输出队列: {stats['output_queue_size']}",
+            f"端到端延迟: 平均 {stats['average_latency']:.2f}ms, 最大 {stats['max_latency']:.2f}ms",
+            "\n过滤器统计:",
+        ]
         for f_stats in stats['filters']:
-            print(f"\n  [{f_stats['name']}]")
-            print(f"    状态: {'启用' if f_stats['enabled'] else '禁用'}")
-            print(f"    处理帧数: {f_stats['processed_count']}")
-            print(f"    错误次数: {f_stats['error_count']}")
-            print(f"    平均耗时: {f_stats['average_time']:.2f}ms")
-            print(f"    错误率: {f_stats['error_rate']:.2f}%")
+            lines.append(f"\n  [{f_stats['name']}]")
+            lines.append(f"    状态: {'启用' if f_stats['enabled'] else '禁用'}")
+            lines.append(f"    处理帧数: {f_stats['processed_count']}")
+            lines.append(f"    错误次数: {f_stats['error_count']}")
+            lines.append(f"    平均耗时: {f_stats['average_time']:.2f}ms")
+            lines.append(f"    错误率: {f_stats['error_rate']:.2f}%")
+        lines.append("=" * 60)
         
-        print("=" * 60)
+        return "\n".join(lines)
+    
+    def print_statistics(self):
+        """打印统计信息"""
+        print("\n" + self.format_statistics())
+    
+    def log_statistics(self):
+        """通过日志输出统计信息"""
+        logger.info("\n%s", self.format_statistics())
 
 
 # ==================== 性能监控器 ====================
@@ -356,6 +420,7 @@ class PerformanceMonitor:
         self.report_interval = report_interval
         self.running = False
         self.thread = None
+        self._stop_event = threading.Event()  # 停止时立即唤醒监控线程
         
         logger.info("性能监控器初始化")
     
@@ -365,6 +430,7 @@ class PerformanceMonitor:
             return
         
         self.running = True
+        self._stop_event.clear()
         self.thread = threading.Thread(target=self._monitor, daemon=True)
         self.thread.start()
         logger.info("性能监控器已启动")
@@ -372,15 +438,16 @@ class PerformanceMonitor:
     def stop(self):
         """停止监控"""
         self.running = False
+        self._stop_event.set()
         if self.thread:
             self.thread.join(timeout=2)
         logger.info("性能监控器已停止")
     
     def _monitor(self):
         """监控主循环"""
-        while self.running:
-            time.sleep(self.report_interval)
-            self.pipeline.print_statistics()
+        # wait返回True表示收到停止信号，不再等满整个报告间隔
+        while not self._stop_event.wait(self.report_interval):
+            self.pipeline.log_statistics()
 
 
 if __name__ == "__main__":
@@ -408,10 +475,9 @@ if __name__ == "__main__":
         packet = pipeline.create_packet(frame_number=i)
         pipeline.put(packet)
     
-    # 接收结果
-    time.sleep(1)
+    # 接收结果（get在结果就绪时立即返回，无需预先固定等待）
     for i in range(10):
-        result = pipeline.get()
+        result = pipeline.get(timeout=1.0)
         if result:
             print(f"收到结果: {result}")
     
@@ -4,8 +4,8 @@
 负责管理和调度整个管道系统
 """
 
-import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from pipeline_core import Pipeline, PerformanceMonitor
 from pipeline_config import get_config
 from services import *
@@ -33,6 +33,8 @@ class PipelineScheduler:
         self.performance_monitor = None
         self.running = False
         self.camera_thread = None
+        self.camera_loop_exited = threading.Event()  # 采集循环退出时置位
+        self.latest_packet = None  # 最新处理结果（GUI按自身刷新频率读取）
         
         logger.info("=" * 60)
         logger.info("管道调度器初始化")
@@ -53,40 +55,33 @@ class PipelineScheduler:
                 buffer_size=self.config.pipeline_buffer_size
             )
             
-            # 初始化相机服务（作为数据源，不加入管道）
-            if self.config.camera_service.enabled:
-                self.camera_service = CameraService(self.config.camera_service)
-                logger.info("✓ 相机服务初始化完成")
+            # 各服务的构造相互独立（加载模型、初始化相机SDK等较慢），并发创建后按顺序加入管道
+            service_specs = [
+                (self.config.preprocess_service, PreprocessService, "预处理服务"),
+                (self.config.yolo_service, YOLOService, "YOLO服务"),
+                (self.config.opencv_service, OpenCVService, "OpenCV服务"),
+                (self.config.display_service, DisplayService, "显示服务"),
+                (self.config.storage_service, StorageService, "存储服务"),
+            ]
+            enabled_specs = [spec for spec in service_specs if spec[0].enabled]
             
-            # 添加预处理服务
-            if self.config.preprocess_service.enabled:
-                preprocess = PreprocessService(self.config.preprocess_service)
-                self.pipeline.add_filter(preprocess)
-                logger.info("✓ 预处理服务已添加")
-            
-            # 添加YOLO检测服务
-            if self.config.yolo_service.enabled:
-                yolo = YOLOService(self.config.yolo_service)
-                self.pipeline.add_filter(yolo)
-                logger.info("✓ YOLO服务已添加")
-            
-            # 添加OpenCV处理服务
-            if self.config.opencv_service.enabled:
-                opencv = OpenCVService(self.config.opencv_service)
-                self.pipeline.add_filter(opencv)
-                logger.info("✓ OpenCV服务已添加")
-            
-            # 添加显示服务
-            if self.config.display_service.enabled:
-                display = DisplayService(self.config.display_service)
-                self.pipeline.add_filter(display)
-                logger.info("✓ 显示服务已添加")
-            
-            # 添加存储服务
-            if self.config.storage_service.enabled:
-                storage = StorageService(self.config.storage_service)
-                self.pipeline.add_filter(storage)
-                logger.info("✓ 存储服务已添加")
+            with ThreadPoolExecutor(max_workers=len(enabled_specs) + 1,
+                                    thread_name_prefix="ServiceInit") as executor:
+                # 相机作为数据源，不加入管道
+                camera_future = None
+                if self.config.camera_service.enabled:
+                    camera_future = executor.submit(CameraService, self.config.camera_service)
+                
+                futures = [executor.submit(service_class, service_config)
+                           for service_config, service_class, _ in enabled_specs]
+                
+                if camera_future is not None:
+                    self.camera_service = camera_future.result()
+                    logger.info("✓ 相机服务初始化完成")
+                
+                for (_, _, label), future in zip(enabled_specs, futures):
+                    self.pipeline.add_filter(future.result())
+                    logger.info(f"✓ {label}已添加")
             
             # 创建性能监控器
             if self.config.enable_performance_monitor:
@@ -142,6 +137,7 @@ class PipelineScheduler:
             
             # 启动相机采集线程
             self.running = True
+            self.camera_loop_exited.clear()
             self.camera_thread = threading.Thread(target=self._camera_loop, daemon=True)
             self.camera_thread.start()
             
@@ -168,11 +164,16 @@ class PipelineScheduler:
                     if not self.pipeline.put(packet, timeout=0.1):
                         logger.warning("管道输入队列已满，丢弃帧")
                     
-                    # 从管道获取处理结果
-                    result = self.pipeline.get(timeout=0.01)
-                    if result and result.metadata.get('user_exit'):
-                        logger.info("收到用户退出信号")
-                        self.running = False
+                    # 取出已完成的处理结果（不等待，避免每帧阻塞采集）
+                    result = self.pipeline.get(timeout=0)
+                    while result:
+                        self.latest_packet = result
+                        if result.metadata.get('user_exit'):
+                            logger.info("收到用户退出信号")
+                            self.running = False
+                            break
+                        result = self.pipeline.get(timeout=0)
+                    if not self.running:
                         break
                 
                 # 检查最大帧数
@@ -186,6 +187,7 @@ class PipelineScheduler:
                 logger.exception(f"采集循环异常: {e}")
         
         logger.info("相机采集线程退出")
+        self.camera_loop_exited.set()
     
     def stop(self):
         """停止管道系统"""
@@ -235,9 +237,9 @@ class PipelineScheduler:
             return
         
         try:
-            # 等待用户中断
-            while self.running:
-                time.sleep(0.1)
+            # 等待采集循环退出或用户中断（带超时等待，保证Ctrl+C能及时响应）
+            while not self.camera_loop_exited.wait(timeout=1.0):
+                pass
         except KeyboardInterrupt:
             logger.info("收到中断信号 (Ctrl+C)")
         finally:
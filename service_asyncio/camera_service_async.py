@@ -9,6 +9,7 @@ import os
 import platform
 import asyncio
 import time
+from concurrent.futures import ThreadPoolExecutor
 from ctypes import *
 from typing import List, Optional
 
@@ -381,6 +382,7 @@ class MultiCameraManager:
             return False
         
         # 为每个设备创建相机服务
+        camera_devices = []
         for i in range(self.device_list.nDeviceNum):
             camera_id = f"camera_{i}"
             camera_service = AsyncCameraService(self.config, camera_id)
@@ -390,13 +392,22 @@ class MultiCameraManager:
                 self.device_list.pDeviceInfo[i],
                 POINTER(MV_CC_DEVICE_INFO)
             ).contents
-            
-            # 打开设备
-            if camera_service.open_device(st_device_info):
+            camera_devices.append((camera_service, st_device_info))
+        
+        # 并发打开设备（GigE相机打开需要较长时间，各设备互不依赖）
+        with ThreadPoolExecutor(max_workers=len(camera_devices),
+                                thread_name_prefix="CameraOpen") as executor:
+            results = list(executor.map(
+                lambda device: device[0].open_device(device[1]),
+                camera_devices
+            ))
+        
+        for (camera_service, _), opened in zip(camera_devices, results):
+            if opened:
                 self.cameras.append(camera_service)
-                logger.info(f"[{camera_id}] 相机打开成功")
+                logger.info(f"[{camera_service.camera_id}] 相机打开成功")
             else:
-                logger.error(f"[{camera_id}] 相机打开失败")
+                logger.error(f"[{camera_service.camera_id}] 相机打开失败")
         
         return len(self.cameras) > 0
     
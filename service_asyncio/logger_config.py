@@ -35,9 +35,8 @@ class CameraLogger:
         self.log_dir = log_dir
         self.logger = None
         
-        # 创建日志目录
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
+        # 创建日志目录（已存在时不报错）
+        os.makedirs(log_dir, exist_ok=True)
         
         # 初始化日志器
         self._setup_logger(console_level, file_level, max_bytes, backup_count)
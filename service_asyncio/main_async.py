@@ -222,6 +222,14 @@ async def main_async():
 
 def main():
     """主函数入口"""
+    # 安装了uvloop时使用更快的事件循环（可选依赖）
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        logger.info("使用uvloop事件循环")
+    except ImportError:
+        pass
+    
     try:
         # 运行异步主函数
         asyncio.run(main_async())
@@ -24,7 +24,11 @@ logger = get_logger("AsyncPipelineCore")
 
 
 # ==================== 数据包定义 ====================
-@dataclass
+# Python 3.10+ 使用__slots__存储字段，每帧数据包不再携带实例字典
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class DataPacket:
     """
     管道中传输的数据包
@@ -126,13 +130,13 @@ class AsyncFilter(ABC):
             return packet
         
         try:
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()  # 单调时钟，不受系统时间调整影响
             
             # 调用子类实现的异步处理方法
             result = await self.process(packet)
             
             # 记录处理时间
-            duration = (time.time() - start_time) * 1000  # 转换为毫秒
+            duration = (time.perf_counter_ns() - start_ns) * 1e-6  # 转换为毫秒
             if result:
                 result.add_processing_time(self.name, duration)
             
@@ -175,6 +179,10 @@ class AsyncFilter(ABC):
         self.error_count = 0
         self.total_processing_time = 0.0
         logger.info(f"[{self.name}] 统计信息已重置")
+    
+    async def close(self):
+        """释放过滤器占用的资源（管道停止时调用），默认无操作"""
+        pass
 
 
 # ==================== 异步管道类 ====================
@@ -185,13 +193,15 @@ class AsyncPipeline:
     支持多相机并发处理
     """
     
-    def __init__(self, name: str = "AsyncPipeline", buffer_size: int = 100):
+    def __init__(self, name: str = "AsyncPipeline", buffer_size: int = 100,
+                 collect_output: bool = True):
         """
         初始化异步管道
         
         Args:
             name: 管道名称
             buffer_size: 缓冲区大小
+            collect_output: 是否将处理结果放入输出队列（无消费端时关闭，结果由过滤器自行输出）
         """
         self.name = name
         self.filters: List[AsyncFilter] = []
@@ -201,6 +211,16 @@ class AsyncPipeline:
         self.tasks: List[asyncio.Task] = []
         self.packet_id_counter = 0
         self.worker_count = 4  # 并发工作协程数量
+        self._waiting_workers = set()  # 正阻塞在输入队列上的工作协程ID
+        self.collect_output = collect_output
+        
+        # 端到端延迟统计（毫秒）
+        self.completed_count = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        
+        # 输出队列满时被新结果覆盖的旧数据包数量
+        self.dropped_count = 0
         
         logger.info(f"[{self.name}] 异步管道初始化，缓冲区大小: {buffer_size}, 工作协程: {self.worker_count}")
     
@@ -246,11 +266,23 @@ class AsyncPipeline:
         
         self.running = False
         
-        # 等待所有任务完成
+        # 阻塞在输入队列上的工作协程手中没有数据包，直接取消；
+        # 正在处理的协程完成当前数据包后检查running即退出，不会再进入等待
+        for worker_id in list(self._waiting_workers):
+            self.tasks[worker_id].cancel()
+        
+        # 等待所有工作协程退出
         if self.tasks:
             await asyncio.gather(*self.tasks, return_exceptions=True)
             self.tasks.clear()
         
+        # 释放各过滤器资源（如存储服务的写盘线程池）
+        for filter_obj in self.filters:
+            try:
+                await filter_obj.close()
+            except Exception as e:
+                logger.exception(f"[{self.name}] 关闭过滤器 {filter_obj.name} 异常: {e}")
+        
         logger.info(f"[{self.name}] 异步管道已停止")
     
     async def _worker(self, worker_id: int):
@@ -264,14 +296,14 @@ class AsyncPipeline:
         
         while self.running:
             try:
-                # 从输入队列获取数据包（超时1秒）
+                # 阻塞等待数据包，停止时由stop()取消
+                self._waiting_workers.add(worker_id)
                 try:
-                    packet = await asyncio.wait_for(
-                        self.input_queue.get(),
-                        timeout=1.0
-                    )
-                except asyncio.TimeoutError:
-                    continue
+                    packet = await self.input_queue.get()
+                except asyncio.CancelledError:
+                    break
+                finally:
+                    self._waiting_workers.discard(worker_id)
                 
                 # 依次通过所有过滤器（异步）
                 for filter_obj in self.filters:
@@ -279,21 +311,39 @@ class AsyncPipeline:
                         break
                     packet = await filter_obj.execute(packet)
                 
-                # 将结果放入输出队列
+                # 将结果放入输出队列（无消费端时跳过）
                 if packet is not None:
-                    try:
-                        await asyncio.wait_for(
-                            self.output_queue.put(packet),
-                            timeout=1.0
-                        )
-                    except asyncio.TimeoutError:
-                        logger.warning(f"[{self.name}] 输出队列已满，丢弃数据包")
+                    self._record_latency(packet)
+                    if self.collect_output:
+                        self._put_output(packet)
                 
             except Exception as e:
                 logger.exception(f"[{self.name}] 工作协程 {worker_id} 异常: {e}")
         
         logger.info(f"[{self.name}] 工作协程 {worker_id} 退出")
     
+    def _put_output(self, packet: DataPacket):
+        """
+        放入输出结果，队列已满时丢弃最旧的结果（消费端只关心最新帧）
+        
+        工作协程不再阻塞等待消费端，积压期间中间结果被合并为最新结果
+        """
+        try:
+            self.output_queue.put_nowait(packet)
+        except asyncio.QueueFull:
+            # 同一事件循环内两次操作之间不会让出，腾出的位置必然可用
+            self.output_queue.get_nowait()
+            self.dropped_count += 1
+            self.output_queue.put_nowait(packet)
+    
+    def _record_latency(self, packet: DataPacket):
+        """记录数据包从创建（采集）到处理完成的端到端延迟"""
+        latency = (time.time() - packet.timestamp) * 1000  # 转换为毫秒
+        self.completed_count += 1
+        self.total_latency += latency
+        if latency > self.max_latency:
+            self.max_latency = latency
+    
     async def put(self, packet: DataPacket, timeout: float = 1.0) -> bool:
         """
         向管道输入数据包（异步）
@@ -305,6 +355,13 @@ class AsyncPipeline:
         Returns:
             是否成功放入
         """
+        # 快速路径：队列未满时直接放入，不为wait_for创建额外任务
+        try:
+            self.input_queue.put_nowait(packet)
+            return True
+        except asyncio.QueueFull:
+            pass
+        
         try:
             await asyncio.wait_for(
                 self.input_queue.put(packet),
@@ -315,6 +372,29 @@ class AsyncPipeline:
             logger.warning(f"[{self.name}] 输入队列已满")
             return False
     
+    async def put_many(self, packets: List[DataPacket], timeout: float = 1.0) -> int:
+        """
+        批量向管道输入数据包（异步）
+        队列有空位的数据包直接放入，只有队列满时才等待
+        
+        Args:
+            packets: 数据包列表
+            timeout: 每个数据包的超时时间（秒）
+            
+        Returns:
+            成功放入的数据包数量
+        """
+        put_nowait = self.input_queue.put_nowait
+        count = 0
+        for packet in packets:
+            try:
+                put_nowait(packet)
+                count += 1
+            except asyncio.QueueFull:
+                if await self.put(packet, timeout):
+                    count += 1
+        return count
+    
     async def get(self, timeout: float = 1.0) -> Optional[DataPacket]:
         """
         从管道获取输出数据包（异步）
@@ -359,32 +439,49 @@ class AsyncPipeline:
             "input_queue_size": self.input_queue.qsize(),
             "output_queue_size": self.output_queue.qsize(),
             "worker_count": self.worker_count,
+            "completed_count": self.completed_count,
+            "average_latency": (self.total_latency / self.completed_count
+                                if self.completed_count > 0 else 0),
+            "max_latency": self.max_latency,
+            "dropped_count": self.dropped_count,
             "filters": [f.get_statistics() for f in self.filters]
         }
         return stats
     
-    def print_statistics(self):
-        """打印统计信息"""
+    def format_statistics(self) -> str:
+        """格式化统计信息（多行文本）"""
         stats = self.get_statistics()
         
-        print("\n" + "=" * 60)
-        print(f"异步管道统计: {stats['name']}")
-        print("=" * 60)
-        print(f"运行状态: {'运行中' if stats['running'] else '已停止'}")
-        print(f"输入队列: {stats['input_queue_size']}")
-        print(f"输出队列: {stats['output_queue_size']}")
-        print(f"工作协程: {stats['worker_count']}")
-        
-        print("\n过滤器统计:")
+        lines = [
+            "=" * 60,
+            f"异步管道统计: {stats['name']}",
+            "=" * 60,
+            f"运行状态: {'运行中' if stats['running'] else '已停止'}",
+            f"输入队列: {stats['input_queue_size']}",
+            f"输出队列: {stats['output_queue_size']}",
+            f"工作协程: {stats['worker_count']}",
+            f"端到端延迟: 平均 {stats['average_latency']:.2f}ms, 最大 {stats['max_latency']:.2f}ms",
+            f"丢弃旧结果: {stats['dropped_count']}",
+            "\n过滤器统计:",
+        ]
         for f_stats in stats['filters']:
-            print(f"\n  [{f_stats['name']}]")
-            print(f"    状态: {'启用' if f_stats['enabled'] else '禁用'}")
-            print(f"    处理帧数: {f_stats['processed_count']}")
-            print(f"    错误次数: {f_stats['error_count']}")
-            print(f"    平均耗时: {f_stats['average_time']:.2f}ms")
-            print(f"    错误率: {f_stats['error_rate']:.2f}%")
-        
-        print("=" * 60)
+            lines.append(f"\n  [{f_stats['name']}]")
+            lines.append(f"    状态: {'启用' if f_stats['enabled'] else '禁用'}")
+            lines.append(f"    处理帧数: {f_stats['processed_count']}")
+            lines.append(f"    错误次数: {f_stats['error_count']}")
+            lines.append(f"    平均耗时: {f_stats['average_time']:.2f}ms")
+            lines.append(f"    错误率: {f_stats['error_rate']:.2f}%")
+        lines.append("=" * 60)
+        
+        return "\n".join(lines)
+    
+    def print_statistics(self):
+        """打印统计信息"""
+        print("\n" + self.format_statistics())
+    
+    def log_statistics(self):
+        """通过日志输出统计信息"""
+        logger.info("\n%s", self.format_statistics())
 
 
 # ==================== 异步性能监控器 ====================
@@ -403,6 +500,7 @@ class AsyncPerformanceMonitor:
         self.report_interval = report_interval
         self.running = False
         self.task: Optional[asyncio.Task] = None
+        self._stop_event: Optional[asyncio.Event] = None  # 停止时立即唤醒监控协程
         
         logger.info("异步性能监控器初始化")
     
@@ -412,21 +510,30 @@ class AsyncPerformanceMonitor:
             return
         
         self.running = True
+        self._stop_event = asyncio.Event()
         self.task = asyncio.create_task(self._monitor())
         logger.info("异步性能监控器已启动")
     
     async def stop(self):
         """停止监控"""
         self.running = False
+        if self._stop_event:
+            self._stop_event.set()
         if self.task:
             await self.task
         logger.info("异步性能监控器已停止")
     
     async def _monitor(self):
         """监控主循环"""
+        loop = asyncio.get_running_loop()
         while self.running:
-            await asyncio.sleep(self.report_interval)
-            self.pipeline.print_statistics()
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=self.report_interval)
+                break
+            except asyncio.TimeoutError:
+                pass
+            # 统计汇总和日志输出放到线程池，避免阻塞事件循环
+            await loop.run_in_executor(None, self.pipeline.log_statistics)
 
 
 if __name__ == "__main__":
@@ -455,10 +562,9 @@ if __name__ == "__main__":
             packet = pipeline.create_packet(camera_id=f"camera_{i%2}", frame_number=i)
             await pipeline.put(packet)
         
-        # 接收结果
-        await asyncio.sleep(1)
+        # 接收结果（get在结果就绪时立即返回，无需预先固定等待）
         for i in range(10):
-            result = await pipeline.get()
+            result = await pipeline.get(timeout=1.0)
             if result:
                 print(f"收到结果: {result}")
         
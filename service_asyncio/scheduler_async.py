@@ -8,6 +8,7 @@
 import sys
 import os
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 
 # 添加service_new根目录到路径
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -57,46 +58,40 @@ class AsyncPipelineScheduler:
             self.config.validate()
             self.config.print_config()
             
-            # 创建异步管道
+            # 创建异步管道（结果由显示、存储服务输出，调度器不读取输出队列）
             self.pipeline = AsyncPipeline(
                 name="AsyncVisionPipeline",
-                buffer_size=self.config.pipeline_buffer_size
+                buffer_size=self.config.pipeline_buffer_size,
+                collect_output=False
             )
             
-            # 初始化多相机管理器
-            if self.config.camera_service.enabled:
-                self.camera_manager = MultiCameraManager(self.config.camera_service)
-                logger.info("✓ 多相机管理器初始化完成")
+            # 各服务的构造相互独立（加载模型、初始化相机SDK等较慢），并发创建后按顺序加入管道
+            service_specs = [
+                (self.config.preprocess_service, AsyncPreprocessService, "异步预处理服务"),
+                (self.config.yolo_service, AsyncYOLOService, "异步YOLO服务"),
+                (self.config.opencv_service, AsyncOpenCVService, "异步OpenCV服务"),
+                (self.config.display_service, AsyncDisplayService, "异步显示服务"),
+                (self.config.storage_service, AsyncStorageService, "异步存储服务"),
+            ]
+            enabled_specs = [spec for spec in service_specs if spec[0].enabled]
             
-            # 添加预处理服务
-            if self.config.preprocess_service.enabled:
-                preprocess = AsyncPreprocessService(self.config.preprocess_service)
-                self.pipeline.add_filter(preprocess)
-                logger.info("✓ 异步预处理服务已添加")
-            
-            # 添加YOLO检测服务
-            if self.config.yolo_service.enabled:
-                yolo = AsyncYOLOService(self.config.yolo_service)
-                self.pipeline.add_filter(yolo)
-                logger.info("✓ 异步YOLO服务已添加")
-            
-            # 添加OpenCV处理服务
-            if self.config.opencv_service.enabled:
-                opencv = AsyncOpenCVService(self.config.opencv_service)
-                self.pipeline.add_filter(opencv)
-                logger.info("✓ 异步OpenCV服务已添加")
-            
-            # 添加显示服务
-            if self.config.display_service.enabled:
-                display = AsyncDisplayService(self.config.display_service)
-                self.pipeline.add_filter(display)
-                logger.info("✓ 异步显示服务已添加")
-            
-            # 添加存储服务
-            if self.config.storage_service.enabled:
-                storage = AsyncStorageService(self.config.storage_service)
-                self.pipeline.add_filter(storage)
-                logger.info("✓ 异步存储服务已添加")
+            with ThreadPoolExecutor(max_workers=len(enabled_specs) + 1,
+                                    thread_name_prefix="ServiceInit") as executor:
+                # 相机作为数据源，不加入管道
+                camera_future = None
+                if self.config.camera_service.enabled:
+                    camera_future = executor.submit(MultiCameraManager, self.config.camera_service)
+                
+                futures = [executor.submit(service_class, service_config)
+                           for service_config, service_class, _ in enabled_specs]
+                
+                if camera_future is not None:
+                    self.camera_manager = camera_future.result()
+                    logger.info("✓ 多相机管理器初始化完成")
+                
+                for (_, _, label), future in zip(enabled_specs, futures):
+                    self.pipeline.add_filter(future.result())
+                    logger.info(f"✓ {label}已添加")
             
             # 创建性能监控器
             if self.config.enable_performance_monitor:
@@ -124,21 +119,23 @@ class AsyncPipelineScheduler:
             logger.info("启动异步管道系统")
             logger.info("=" * 60)
             
-            # 启动相机
+            # 启动相机（SDK调用是阻塞的，放到线程池中执行，避免阻塞事件循环）
             if self.camera_manager:
+                loop = asyncio.get_running_loop()
+                
                 # 枚举设备
-                device_count = self.camera_manager.enumerate_devices()
+                device_count = await loop.run_in_executor(None, self.camera_manager.enumerate_devices)
                 if device_count == 0:
                     logger.error("未找到相机设备")
                     return False
                 
                 # 打开所有设备
-                if not self.camera_manager.open_all_cameras():
+                if not await loop.run_in_executor(None, self.camera_manager.open_all_cameras):
                     logger.error("打开相机失败")
                     return False
                 
                 # 开始采集
-                if not self.camera_manager.start_all_cameras():
+                if not await loop.run_in_executor(None, self.camera_manager.start_all_cameras):
                     logger.error("开始采集失败")
                     return False
             
@@ -172,11 +169,10 @@ class AsyncPipelineScheduler:
                 # 从所有相机并发采集图像
                 packets = await self.camera_manager.grab_from_all_cameras()
                 
-                # 将所有数据包送入管道
-                for packet in packets:
-                    if packet:
-                        await self.pipeline.put(packet, timeout=0.1)
-                        frame_count += 1
+                # 将所有数据包批量送入管道
+                if packets:
+                    await self.pipeline.put_many(packets, timeout=0.1)
+                    frame_count += len(packets)
                 
                 # 检查最大帧数
                 if max_frames > 0 and frame_count >= max_frames:
@@ -184,8 +180,10 @@ class AsyncPipelineScheduler:
                     self.running = False
                     break
                 
-                # 短暂休眠，避免CPU占用过高
-                await asyncio.sleep(0.001)
+                # 采集本身在线程池中等待图像，已经让出事件循环；
+                # 仅在没有采集到图像时短暂休眠，避免空转
+                if not packets:
+                    await asyncio.sleep(0.001)
                 
             except Exception as e:
                 logger.exception(f"采集循环异常: {e}")
@@ -205,13 +203,16 @@ class AsyncPipelineScheduler:
             # 停止采集循环
             self.running = False
             
-            # 停止性能监控
+            # 性能监控和管道互不依赖，并发停止；单项失败不影响后续关闭相机
+            stop_tasks = []
             if self.performance_monitor:
-                await self.performance_monitor.stop()
-            
-            # 停止管道
+                stop_tasks.append(self.performance_monitor.stop())
             if self.pipeline:
-                await self.pipeline.stop()
+                stop_tasks.append(self.pipeline.stop())
+            results = await asyncio.gather(*stop_tasks, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"停止组件异常: {result}", exc_info=result)
             
             # 停止相机
             if self.camera_manager:
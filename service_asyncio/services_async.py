@@ -93,6 +93,11 @@ class AsyncStorageService(AsyncFilter):
         # 在线程池中执行同步处理
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(None, self.sync_service.process, packet)
+    
+    async def close(self):
+        """等待未完成的写盘任务并释放资源（阻塞操作放到线程池中执行）"""
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self.sync_service.close)
 
 
 __all__ = [
@@ -5,6 +5,7 @@ Qt主窗口
 """
 
 import sys
+import time
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QLabel, QPushButton, QFrame, QSplitter,
                              QGroupBox, QGridLayout, QTextEdit, QComboBox, QSpinBox,
@@ -22,10 +23,13 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 service_new_root = os.path.dirname(current_dir)
 if service_new_root not in sys.path:
     sys.path.insert(0, service_new_root)
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
 
 from pipeline_config import PipelineConfig, PresetConfigs
 from scheduler import PipelineScheduler
 from logger_config import get_logger
+from widgets import image_to_pixmap
 
 logger = get_logger("QtGUI")
 
@@ -60,19 +64,26 @@ class VisionWorkerThread(QThread):
             self.running = True
             self.status_update.emit("系统运行中")
             
-            # 主循环
-            while self.running:
-                # 这里可以从管道获取处理结果
-                # 暂时使用定时器在主线程更新
-                self.msleep(100)
+            # 进入线程事件循环，直到stop()调用quit()（界面通过定时器读取最新结果）
+            self.exec_()
                 
         except Exception as e:
             logger.exception(f"工作线程异常: {e}")
             self.error_occurred.emit(f"运行异常: {str(e)}")
     
+    def latest_packet(self):
+        """
+        获取最新的处理结果
+        只保留最新一帧，界面按自身刷新频率读取，不会积压信号
+        """
+        if self.scheduler is None:
+            return None
+        return self.scheduler.latest_packet
+    
     def stop(self):
         """停止线程"""
         self.running = False
+        self.quit()
         if self.scheduler:
             self.scheduler.stop()
         self.wait()
@@ -86,6 +97,9 @@ class MainWindow(QMainWindow):
         self.config = PresetConfigs.development()
         self.worker_thread = None
         self.is_running = False
+        self._last_packet_id = None
+        self._display_count = 0
+        self._fps_start_time = time.perf_counter()
         
         self.init_ui()
         self.apply_stylesheet()
@@ -411,6 +425,7 @@ class MainWindow(QMainWindow):
         self.log_text = QTextEdit()
         self.log_text.setObjectName("logText")
         self.log_text.setReadOnly(True)
+        self.log_text.document().setMaximumBlockCount(1000)  # 只保留最近1000行，避免长时间运行后越来越慢
         layout.addWidget(self.log_text)
         
         # 清除按钮
@@ -467,6 +482,7 @@ class MainWindow(QMainWindow):
             if self.worker_thread:
                 self.worker_thread.stop()
                 self.worker_thread = None
+            self._last_packet_id = None
             
             # 更新UI状态
             self.start_btn.setEnabled(True)
@@ -499,10 +515,69 @@ class MainWindow(QMainWindow):
         # TODO: 实现运行时参数更新
     
     def update_display(self):
-        """更新显示"""
-        # TODO: 从管道获取最新图像和检测结果
-        # 这里暂时使用模拟数据
-        pass
+        """更新显示（定时器驱动，只绘制最新一帧）"""
+        if self.worker_thread is None:
+            return
+        
+        packet = self.worker_thread.latest_packet()
+        if packet is None or packet.packet_id == self._last_packet_id:
+            return
+        self._last_packet_id = packet.packet_id
+        
+        try:
+            image = packet.processed_image if packet.processed_image is not None else packet.image
+            if image is not None:
+                self._show_image(image)
+            
+            self._update_detections(packet.detections)
+            self.frame_count_label.setText(str(packet.frame_number))
+            
+            # 统计界面刷新帧率
+            self._display_count += 1
+            now = time.perf_counter()
+            elapsed = now - self._fps_start_time
+            if elapsed >= 1.0:
+                self.fps_label.setText(f"FPS: {self._display_count / elapsed:.1f}")
+                self._display_count = 0
+                self._fps_start_time = now
+                
+        except Exception as e:
+            logger.exception(f"更新显示异常: {e}")
+    
+    def _show_image(self, image):
+        """在图像区域显示图像"""
+        pixmap = image_to_pixmap(image).scaled(
+            self.image_label.size(),
+            Qt.KeepAspectRatio,
+            Qt.SmoothTransformation
+        )
+        self.image_label.setPixmap(pixmap)
+    
+    def _update_detections(self, detections):
+        """更新检测结果表格和统计"""
+        table = self.detection_table
+        
+        # 批量填充期间暂停重绘和信号，填充完成后统一刷新一次
+        table.setUpdatesEnabled(False)
+        table.blockSignals(True)
+        try:
+            table.setRowCount(len(detections))
+            for row, det in enumerate(detections):
+                x1, y1, x2, y2 = det.get('bbox', [0, 0, 0, 0])
+                table.setItem(row, 0, QTableWidgetItem(str(det.get('class_name', 'unknown'))))
+                table.setItem(row, 1, QTableWidgetItem(f"{det.get('confidence', 0.0):.2f}"))
+                table.setItem(row, 2, QTableWidgetItem(f"{(x1 + x2) / 2:.0f}"))
+                table.setItem(row, 3, QTableWidgetItem(f"{(y1 + y2) / 2:.0f}"))
+        finally:
+            table.blockSignals(False)
+            table.setUpdatesEnabled(True)
+        
+        self.det_count_label.setText(str(len(detections)))
+        if detections:
+            avg_conf = sum(det.get('confidence', 0.0) for det in detections) / len(detections)
+            self.avg_conf_label.setText(f"{avg_conf:.2f}")
+        else:
+            self.avg_conf_label.setText("0.00")
     
     def on_status_update(self, message):
         """状态更新回调"""
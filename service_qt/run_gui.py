@@ -13,7 +13,7 @@ if service_new_root not in sys.path:
     sys.path.insert(0, service_new_root)
 
 from PyQt5.QtWidgets import QApplication, QSplashScreen
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QPixmap, QPainter, QColor, QFont
 from main_window import MainWindow
 from logger_config import get_logger
@@ -76,7 +76,7 @@ def main():
         splash.show()
         app.processEvents()
         
-        # 模拟加载过程
+        # 更新加载提示
         def update_splash(message):
             splash.showMessage(
                 message,
@@ -86,16 +86,14 @@ def main():
             app.processEvents()
         
         update_splash("初始化系统...")
-        QTimer.singleShot(500, lambda: update_splash("加载配置..."))
-        QTimer.singleShot(1000, lambda: update_splash("加载模块..."))
-        QTimer.singleShot(1500, lambda: update_splash("准备就绪"))
         
         # 创建主窗口
         window = MainWindow()
+        update_splash("准备就绪")
         
-        # 2秒后关闭启动画面并显示主窗口
-        QTimer.singleShot(2000, splash.close)
-        QTimer.singleShot(2000, window.show)
+        # 主窗口创建完成后立即显示，并关闭启动画面
+        window.show()
+        splash.finish(window)
         
         logger.info("Qt GUI启动成功")
         
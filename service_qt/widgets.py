@@ -5,11 +5,40 @@
 """
 
 from PyQt5.QtWidgets import QLabel, QWidget, QVBoxLayout
-from PyQt5.QtCore import Qt, pyqtSignal, QSize
-from PyQt5.QtGui import QPixmap, QImage, QPainter, QPen, QColor, QFont
+from PyQt5.QtCore import Qt, pyqtSignal, QSize, QPoint
+from PyQt5.QtGui import QPixmap, QImage, QPainter, QPen, QColor, QFont, QPolygon
 import numpy as np
 import cv2
 
+# Qt 5.14+ 支持直接使用BGR数据构建QImage，省去逐帧颜色转换
+_BGR888 = getattr(QImage, 'Format_BGR888', None)
+
+
+def image_to_pixmap(image):
+    """
+    将OpenCV图像（BGR或灰度）转换为QPixmap
+    
+    支持BGR格式时直接引用图像数据，否则先转换为RGB
+    
+    Args:
+        image: numpy图像数组
+        
+    Returns:
+        QPixmap（数据已复制，不再引用原数组）
+    """
+    if image.ndim == 2:
+        image_format = QImage.Format_Grayscale8
+    elif _BGR888 is not None:
+        image_format = _BGR888
+    else:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        image_format = QImage.Format_RGB888
+    
+    image = np.ascontiguousarray(image)
+    h, w = image.shape[:2]
+    qt_image = QImage(image.data, w, h, image.strides[0], image_format)
+    return QPixmap.fromImage(qt_image)
+
 
 class ImageDisplayWidget(QLabel):
     """
@@ -107,16 +136,8 @@ class ImageDisplayWidget(QLabel):
         if self.current_image is None:
             return
         
-        # 转换BGR到RGB
-        rgb_image = cv2.cvtColor(self.current_image, cv2.COLOR_BGR2RGB)
-        
-        # 创建QImage
-        h, w, ch = rgb_image.shape
-        bytes_per_line = ch * w
-        qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format_RGB888)
-        
         # 创建QPixmap并缩放
-        pixmap = QPixmap.fromImage(qt_image)
+        pixmap = image_to_pixmap(self.current_image)
         
         # 按比例缩放以适应控件大小
         scaled_pixmap = pixmap.scaled(
@@ -157,10 +178,23 @@ class StatusIndicator(QWidget):
     显示圆形状态灯
     """
     
+    # 状态颜色映射（所有实例共享，绘制时不再重复创建）
+    STATUS_COLORS = {
+        "inactive": QColor(100, 100, 100),  # 灰色
+        "active": QColor(0, 204, 102),      # 绿色
+        "warning": QColor(255, 165, 0),     # 橙色
+        "error": QColor(255, 68, 68)        # 红色
+    }
+    STATUS_PENS = {
+        status: QPen(color.darker(120), 2) for status, color in STATUS_COLORS.items()
+    }
+    TEXT_COLOR = QColor(224, 224, 224)
+    
     def __init__(self, label="状态", parent=None):
         super().__init__(parent)
         self.label = label
         self.status = "inactive"  # inactive, active, warning, error
+        self.label_font = QFont("Microsoft YaHei", 10)
         self.setMinimumSize(100, 30)
     
     def set_status(self, status):
@@ -170,6 +204,8 @@ class StatusIndicator(QWidget):
         Args:
             status: inactive/active/warning/error
         """
+        if status == self.status:
+            return
         self.status = status
         self.update()
     
@@ -178,24 +214,16 @@ class StatusIndicator(QWidget):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
         
-        # 状态颜色映射
-        colors = {
-            "inactive": QColor(100, 100, 100),  # 灰色
-            "active": QColor(0, 204, 102),      # 绿色
-            "warning": QColor(255, 165, 0),     # 橙色
-            "error": QColor(255, 68, 68)        # 红色
-        }
-        
-        color = colors.get(self.status, colors["inactive"])
+        status = self.status if self.status in self.STATUS_COLORS else "inactive"
         
         # 绘制圆形指示灯
-        painter.setBrush(color)
-        painter.setPen(QPen(color.darker(120), 2))
+        painter.setBrush(self.STATUS_COLORS[status])
+        painter.setPen(self.STATUS_PENS[status])
         painter.drawEllipse(5, 5, 20, 20)
         
         # 绘制文字
-        painter.setPen(QColor(224, 224, 224))
-        painter.setFont(QFont("Microsoft YaHei", 10))
+        painter.setPen(self.TEXT_COLOR)
+        painter.setFont(self.label_font)
         painter.drawText(30, 20, self.label)
 
 
@@ -209,7 +237,15 @@ class PerformanceChart(QWidget):
         super().__init__(parent)
         self.title = title
         self.max_points = max_points
-        self.data_points = []
+        
+        # 固定大小的环形缓冲区，_cursor为下一个写入位置
+        self._buffer = np.zeros(max_points, dtype=np.float64)
+        self._cursor = 0
+        self._count = 0
+        
+        # 背景网格与各数据点横坐标缓存，尺寸变化时重建
+        self._grid_pixmap = None
+        self._x_positions = None
         self.setMinimumSize(300, 150)
         
         self.setStyleSheet("""
@@ -218,30 +254,41 @@ class PerformanceChart(QWidget):
             border-radius: 3px;
         """)
     
+    @property
+    def data_points(self):
+        """按时间顺序（最旧的在前）返回数据点数组"""
+        if self._count < self.max_points:
+            return self._buffer[:self._count]
+        return np.concatenate((self._buffer[self._cursor:], self._buffer[:self._cursor]))
+    
     def add_data_point(self, value):
         """添加数据点"""
-        self.data_points.append(value)
-        if len(self.data_points) > self.max_points:
-            self.data_points.pop(0)
+        self._buffer[self._cursor] = value
+        self._cursor = (self._cursor + 1) % self.max_points
+        if self._count < self.max_points:
+            self._count += 1
         self.update()
     
     def clear(self):
         """清除数据"""
-        self.data_points.clear()
+        self._cursor = 0
+        self._count = 0
         self.update()
     
-    def paintEvent(self, event):
-        """绘制事件"""
-        if not self.data_points:
-            return
+    def resizeEvent(self, event):
+        """尺寸变化时丢弃网格与横坐标缓存"""
+        self._grid_pixmap = None
+        self._x_positions = None
+        super().resizeEvent(event)
+    
+    def _build_grid_pixmap(self, width, height):
+        """将背景网格绘制到透明像素图中，供每次重绘直接贴图"""
+        pixmap = QPixmap(width, height)
+        pixmap.fill(Qt.transparent)
         
-        painter = QPainter(self)
+        painter = QPainter(pixmap)
         painter.setRenderHint(QPainter.Antialiasing)
-        
-        # 绘制背景网格
         painter.setPen(QPen(QColor(62, 62, 62), 1))
-        width = self.width()
-        height = self.height()
         
         # 水平网格线
         for i in range(5):
@@ -253,29 +300,52 @@ class PerformanceChart(QWidget):
             x = int(width * i / 9)
             painter.drawLine(x, 0, x, height)
         
+        painter.end()
+        return pixmap
+    
+    def paintEvent(self, event):
+        """绘制事件"""
+        if self._count == 0:
+            return
+        
+        width = self.width()
+        height = self.height()
+        
+        # 绘制背景网格（缓存）
+        if self._grid_pixmap is None:
+            self._grid_pixmap = self._build_grid_pixmap(width, height)
+        
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._grid_pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        
         # 绘制数据曲线
-        if len(self.data_points) > 1:
+        data_points = self.data_points
+        if len(data_points) > 1:
             painter.setPen(QPen(QColor(0, 217, 255), 2))
             
-            max_value = max(self.data_points) if self.data_points else 1
-            min_value = min(self.data_points) if self.data_points else 0
+            max_value = data_points.max()
+            min_value = data_points.min()
             value_range = max_value - min_value if max_value != min_value else 1
             
-            points = []
-            for i, value in enumerate(self.data_points):
-                x = int(width * i / (self.max_points - 1))
-                y = int(height - (height * (value - min_value) / value_range))
-                points.append((x, y))
+            # 横坐标只取决于宽度和槽位序号，按整个缓冲区长度缓存
+            if self._x_positions is None:
+                self._x_positions = (
+                    width * np.arange(self.max_points) / (self.max_points - 1)
+                ).astype(np.int32).tolist()
+            
+            # 纵坐标映射整体向量化计算，zip按实际数据点数截断横坐标
+            ys = (height - height * (data_points - min_value) / value_range).astype(np.int32)
+            points = QPolygon([QPoint(x, y) for x, y in zip(self._x_positions, ys.tolist())])
             
-            for i in range(len(points) - 1):
-                painter.drawLine(points[i][0], points[i][1], 
-                               points[i+1][0], points[i+1][1])
+            # 整条曲线一次提交绘制
+            painter.drawPolyline(points)
         
         # 绘制标题和当前值
         painter.setPen(QColor(224, 224, 224))
         painter.setFont(QFont("Microsoft YaHei", 10, QFont.Bold))
         
-        current_value = self.data_points[-1] if self.data_points else 0
+        current_value = self._buffer[self._cursor - 1]
         text = f"{self.title}: {current_value:.2f}"
         painter.drawText(10, 20, text)
 
@@ -1,14 +1,22 @@
 # -*- coding: utf-8 -*-
 """
 微服务模块包
+
+服务类按需导入：仅在首次访问时加载对应子模块，
+导入单个子模块（如 services.preprocess_service）不会连带加载YOLO等重量级依赖
 """
 
-from .camera_service import CameraService
-from .preprocess_service import PreprocessService
-from .yolo_service import YOLOService
-from .opencv_service import OpenCVService
-from .display_service import DisplayService
-from .storage_service import StorageService
+import importlib
+
+# 服务类名 -> 所在子模块
+_SERVICE_MODULES = {
+    'CameraService': '.camera_service',
+    'PreprocessService': '.preprocess_service',
+    'YOLOService': '.yolo_service',
+    'OpenCVService': '.opencv_service',
+    'DisplayService': '.display_service',
+    'StorageService': '.storage_service',
+}
 
 __all__ = [
     'CameraService',
@@ -18,3 +26,17 @@ __all__ = [
     'DisplayService',
     'StorageService',
 ]
+
+
+def __getattr__(name):
+    """首次访问服务类时导入其子模块并缓存到包命名空间"""
+    module_name = _SERVICE_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
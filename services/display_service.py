@@ -5,6 +5,8 @@
 """
 
 import cv2
+import numpy as np
+import threading
 import time
 from pipeline_core import Filter, DataPacket
 from logger_config import get_logger
@@ -25,11 +27,18 @@ class DisplayService(Filter):
         super().__init__("DisplayService", config)
         
         self.window_created = False
-        self.last_display_time = 0
+        self.next_display_time = float('-inf')  # 下一帧允许显示的最早时间
         self.fps_counter = 0
-        self.fps_start_time = time.time()
+        self.fps_start_time = time.perf_counter()
         self.current_fps = 0
         
+        # 显示最小间隔只计算一次（0表示不限制帧率）
+        fps_limit = self.config.display_fps_limit
+        self._min_interval = 1.0 / fps_limit if fps_limit > 0 else 0.0
+        
+        # 叠加绘制用的显示缓冲区，每个调用线程各自一份（异步管道会在多个线程中并发调用），尺寸不变时逐帧复用
+        self._display_local = threading.local()
+        
         logger.info("显示服务初始化完成")
     
     def process(self, packet: DataPacket) -> DataPacket:
@@ -46,14 +55,12 @@ class DisplayService(Filter):
             return packet
         
         try:
-            # 帧率限制
-            current_time = time.time()
-            if self.config.display_fps_limit > 0:
-                min_interval = 1.0 / self.config.display_fps_limit
-                if current_time - self.last_display_time < min_interval:
-                    return packet
+            # 帧率限制（每帧只读取一次单调时钟，FPS统计共用）
+            current_time = time.perf_counter()
+            if current_time < self.next_display_time:
+                return packet
             
-            self.last_display_time = current_time
+            self.next_display_time = current_time + self._min_interval
             
             # 创建窗口
             if not self.window_created:
@@ -66,15 +73,20 @@ class DisplayService(Filter):
                     )
                 self.window_created = True
             
-            # 准备显示图像
-            display_image = packet.processed_image.copy()
+            # 准备显示图像（只有需要叠加绘制时才复制，避免修改数据包中的图像）
+            draw_detections = self.config.show_detections and bool(packet.detections)
+            draw_overlay = self.config.show_fps or self.config.show_frame_count or self.config.show_timestamp
+            if draw_detections or draw_overlay:
+                display_image = self._copy_to_display_buffer(packet.processed_image)
+            else:
+                display_image = packet.processed_image
             
             # 绘制检测结果
-            if self.config.show_detections and packet.detections:
+            if draw_detections:
                 display_image = self._draw_detections(display_image, packet.detections)
             
             # 添加信息叠加
-            if self.config.show_fps or self.config.show_frame_count or self.config.show_timestamp:
+            if draw_overlay:
                 display_image = self._add_overlay_info(display_image, packet)
             
             # 显示图像
@@ -87,7 +99,7 @@ class DisplayService(Filter):
                 packet.metadata['user_exit'] = True
             
             # 更新FPS
-            self._update_fps()
+            self._update_fps(current_time)
             
             return packet
             
@@ -95,6 +107,14 @@ class DisplayService(Filter):
             logger.exception(f"显示异常: {e}")
             return packet
     
+    def _copy_to_display_buffer(self, image):
+        """将图像复制到当前线程复用的显示缓冲区"""
+        buffer = getattr(self._display_local, 'buffer', None)
+        if buffer is None or buffer.shape != image.shape or buffer.dtype != image.dtype:
+            buffer = self._display_local.buffer = np.empty_like(image)
+        np.copyto(buffer, image)
+        return buffer
+    
     def _draw_detections(self, image, detections):
         """绘制检测结果"""
         for det in detections:
@@ -165,15 +185,15 @@ class DisplayService(Filter):
         
         return image
     
-    def _update_fps(self):
+    def _update_fps(self, current_time):
         """更新FPS计算"""
         self.fps_counter += 1
-        elapsed = time.time() - self.fps_start_time
+        elapsed = current_time - self.fps_start_time
         
         if elapsed >= 1.0:
             self.current_fps = self.fps_counter / elapsed
             self.fps_counter = 0
-            self.fps_start_time = time.time()
+            self.fps_start_time = current_time
     
     def __del__(self):
         """析构函数"""
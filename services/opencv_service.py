@@ -11,6 +11,13 @@ from logger_config import get_logger
 
 logger = get_logger("OpenCVService")
 
+# 形态学操作名称与OpenCV操作类型的对应关系
+_MORPHOLOGY_OPERATIONS = {
+    "open": cv2.MORPH_OPEN,
+    "close": cv2.MORPH_CLOSE,
+    "gradient": cv2.MORPH_GRADIENT,
+}
+
 
 class OpenCVService(Filter):
     """OpenCV图像处理服务"""
@@ -23,6 +30,12 @@ class OpenCVService(Filter):
             config: OpenCVServiceConfig配置对象
         """
         super().__init__("OpenCVService", config)
+        
+        # 形态学核与操作类型只构建一次
+        kernel_size = self.config.morphology_kernel_size
+        self._morphology_kernel = np.ones((kernel_size, kernel_size), np.uint8)
+        self._morphology_op = _MORPHOLOGY_OPERATIONS.get(self.config.morphology_operation)
+        
         logger.info("OpenCV服务初始化完成")
     
     def process(self, packet: DataPacket) -> DataPacket:
@@ -39,7 +52,8 @@ class OpenCVService(Filter):
             return packet
         
         try:
-            image = packet.processed_image.copy()
+            # 仅在需要绘制轮廓时复制图像，检测操作本身不修改输入
+            image = packet.processed_image
             
             # 边缘检测
             if self.config.edge_detection_enabled:
@@ -51,7 +65,8 @@ class OpenCVService(Filter):
                 contours = self._detect_contours(image)
                 packet.metadata['contours'] = contours
                 
-                # 在图像上绘制轮廓
+                # 在图像副本上绘制轮廓
+                image = image.copy()
                 cv2.drawContours(image, contours, -1, (0, 255, 0), 2)
             
             # 形态学操作
@@ -93,16 +108,7 @@ class OpenCVService(Filter):
     
     def _apply_morphology(self, image):
         """形态学操作"""
-        kernel = np.ones(
-            (self.config.morphology_kernel_size, self.config.morphology_kernel_size),
-            np.uint8
-        )
-        
-        if self.config.morphology_operation == "open":
-            return cv2.morphologyEx(image, cv2.MORPH_OPEN, kernel)
-        elif self.config.morphology_operation == "close":
-            return cv2.morphologyEx(image, cv2.MORPH_CLOSE, kernel)
-        elif self.config.morphology_operation == "gradient":
-            return cv2.morphologyEx(image, cv2.MORPH_GRADIENT, kernel)
+        if self._morphology_op is None:
+            return image
         
-        return image
+        return cv2.morphologyEx(image, self._morphology_op, self._morphology_kernel)
@@ -23,6 +23,17 @@ class PreprocessService(Filter):
             config: PreprocessServiceConfig配置对象
         """
         super().__init__("PreprocessService", config)
+        
+        # 锐化卷积核只构建一次（float32，避免filter2D使用float64内核）
+        self._sharpen_kernel = np.array([[-1, -1, -1],
+                                         [-1,  9, -1],
+                                         [-1, -1, -1]], dtype=np.float32) * np.float32(self.config.sharpen_strength)
+        
+        # 亮度对比度调整是逐像素的固定映射，预先计算查找表
+        self._brightness_contrast_lut = None
+        if self.config.brightness_adjust != 0 or self.config.contrast_adjust != 0:
+            self._brightness_contrast_lut = self._build_brightness_contrast_lut()
+        
         logger.info("预处理服务初始化完成")
     
     def process(self, packet: DataPacket) -> DataPacket:
@@ -59,7 +70,7 @@ class PreprocessService(Filter):
                 image = self._sharpen_image(image)
             
             # 亮度对比度调整
-            if self.config.brightness_adjust != 0 or self.config.contrast_adjust != 0:
+            if self._brightness_contrast_lut is not None:
                 image = self._adjust_brightness_contrast(image)
             
             # 更新数据包
@@ -114,13 +125,15 @@ class PreprocessService(Filter):
     
     def _sharpen_image(self, image):
         """图像锐化"""
-        kernel = np.array([[-1,-1,-1],
-                          [-1, 9,-1],
-                          [-1,-1,-1]]) * self.config.sharpen_strength
-        return cv2.filter2D(image, -1, kernel)
+        return cv2.filter2D(image, -1, self._sharpen_kernel)
     
-    def _adjust_brightness_contrast(self, image):
-        """调整亮度和对比度"""
+    def _build_brightness_contrast_lut(self):
+        """构建亮度对比度查找表（与cv2.convertScaleAbs结果一致）"""
         alpha = 1.0 + self.config.contrast_adjust / 100.0
         beta = self.config.brightness_adjust
-        return cv2.convertScaleAbs(image, alpha=alpha, beta=beta)
+        values = np.abs(np.arange(256, dtype=np.float64) * alpha + beta)
+        return np.clip(np.rint(values), 0, 255).astype(np.uint8)
+    
+    def _adjust_brightness_contrast(self, image):
+        """调整亮度和对比度（查表，避免逐帧浮点运算）"""
+        return cv2.LUT(image, self._brightness_contrast_lut)
@@ -5,14 +5,81 @@
 """
 
 import cv2
+import errno
 import json
+import mmap
 import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 from pipeline_core import Filter, DataPacket
 from logger_config import get_logger
 
 logger = get_logger("StorageService")
 
+# 图像索引日志：每条记录为 (写入时间ns, 文件名长度) + 文件名，写入时间为0表示删除标记
+_INDEX_FILENAME = ".storage_index.log"
+_INDEX_ENTRY = struct.Struct('<QH')
+
+# O_DIRECT要求缓冲区地址和写入长度按块大小对齐
+_DIRECT_IO_ALIGN = 4096
+
+# 按挂载点共享的写盘线程池 {挂载点: [线程池, 引用计数, 线程数]}
+_WRITE_POOLS = {}
+_WRITE_POOLS_LOCK = threading.Lock()
+
+
+def _mount_point(path):
+    """获取路径所在的挂载点"""
+    path = os.path.realpath(path)
+    while not os.path.ismount(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path
+
+
+def _acquire_write_pool(save_path, workers):
+    """
+    获取保存目录所在磁盘的写盘线程池，不存在则创建
+    
+    Returns:
+        (挂载点, 线程池)
+    """
+    key = _mount_point(save_path)
+    with _WRITE_POOLS_LOCK:
+        entry = _WRITE_POOLS.get(key)
+        if entry is None:
+            pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ImageWriter")
+            entry = _WRITE_POOLS[key] = [pool, 0, workers]
+            logger.info("创建写盘线程池: %s (%d 线程)", key, workers)
+        elif entry[2] != workers:
+            logger.warning("磁盘 %s 已有 %d 线程的写盘线程池，忽略本服务配置的 write_workers=%d",
+                           key, entry[2], workers)
+        entry[1] += 1
+        return key, entry[0]
+
+
+def _release_write_pool(key, wait=True):
+    """
+    释放写盘线程池引用，最后一个使用者释放时关闭线程池
+    
+    Args:
+        key: 挂载点
+        wait: 是否等待线程池中的任务完成（在写盘线程中调用时必须为False）
+    """
+    with _WRITE_POOLS_LOCK:
+        entry = _WRITE_POOLS[key]
+        entry[1] -= 1
+        if entry[1] > 0:
+            return
+        del _WRITE_POOLS[key]
+    entry[0].shutdown(wait=wait)
+
 
 class StorageService(Filter):
     """数据存储服务"""
@@ -26,9 +93,51 @@ class StorageService(Filter):
         """
         super().__init__("StorageService", config)
         
+        # 已保存图像索引（按写入顺序，最旧的在前）
+        self._saved_images = OrderedDict()
+        self._index_path = os.path.join(self.config.save_path, _INDEX_FILENAME)
+        self._index_file = None
+        self._index_tombstones = 0
+        self._index_lock = threading.Lock()
+        self._limit_saved_images = self.config.save_images and self.config.max_saved_images > 0
+        
+        # 编码参数只构建一次，避免每帧重新分配
+        if self.config.save_images and self.config.save_format.lower() == 'jpg':
+            self._imwrite_params = [cv2.IMWRITE_JPEG_QUALITY, self.config.jpeg_quality]
+        else:
+            self._imwrite_params = []
+        
+        # 直接写盘（O_DIRECT）仅在支持的平台上启用
+        self._direct_io = self.config.direct_io and hasattr(os, 'O_DIRECT')
+        self._direct_local = threading.local()  # 每个写盘线程各自的对齐缓冲区
+        if self.config.direct_io and not self._direct_io:
+            logger.warning("当前平台不支持O_DIRECT，使用普通方式写入图像")
+        
+        # 保存路径前缀和扩展名只拼接一次
+        self._save_prefix = os.path.join(self.config.save_path, '')
+        self._save_suffix = '.' + self.config.save_format
+        
         # 创建保存目录
         if self.config.save_images:
             os.makedirs(self.config.save_path, exist_ok=True)
+            if self._limit_saved_images:
+                self._load_index()
+        
+        # 检测日志目录在初始化时创建，刷新时无需再检查
+        if self.config.save_detections:
+            log_dir = os.path.dirname(self.config.detection_log_path)
+            if log_dir:
+                os.makedirs(log_dir, exist_ok=True)
+        
+        # 写盘线程池（同一磁盘上的存储服务共享）
+        self._write_pool_key = None
+        self._write_pool = None
+        self._write_pool_lock = threading.Lock()
+        self._pending_writes = set()
+        # 限制未完成的写盘任务数（每个任务持有一整帧图像），写盘跟不上时让管道等待
+        self._write_slots = threading.BoundedSemaphore(max(2 * self.config.write_workers, 1))
+        if self.config.save_images:
+            self._get_write_pool()
         
         self.detection_log = []
         
@@ -69,29 +178,215 @@ class StorageService(Filter):
             return packet
             
         except Exception as e:
-            logger.exception(f"存储异常: {e}")
+            logger.exception("存储异常: %s", e)
             return packet
     
     def _save_image(self, packet: DataPacket):
-        """保存图像"""
-        try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-            filename = f"frame_{packet.frame_number}_{timestamp}.{self.config.save_format}"
-            filepath = os.path.join(self.config.save_path, filename)
-            
-            if self.config.save_format.lower() == 'jpg':
-                cv2.imwrite(
-                    filepath,
-                    packet.processed_image,
-                    [cv2.IMWRITE_JPEG_QUALITY, self.config.jpeg_quality]
+        """
+        保存图像（配置了写盘线程时提交到线程池异步写入）
+        
+        未完成的写盘任务达到上限时阻塞等待，保持与同步写盘相同的背压；
+        多个写盘线程时图像按写入完成顺序记入索引，数量上限的淘汰顺序可能与采集顺序略有出入
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        filename = f"frame_{packet.frame_number}_{timestamp}{self._save_suffix}"
+        filepath = self._save_prefix + filename
+        
+        pool = self._get_write_pool()
+        if pool is not None:
+            self._write_slots.acquire()
+            try:
+                future = pool.submit(
+                    self._write_image, filepath, filename, packet.processed_image
                 )
+            except Exception:
+                self._write_slots.release()
+                raise
+            self._pending_writes.add(future)
+            future.add_done_callback(self._on_write_done)
+        else:
+            self._write_image(filepath, filename, packet.processed_image)
+    
+    def _get_write_pool(self):
+        """
+        获取写盘线程池（未配置写盘线程时返回None）
+        close()后管道重新启动时在首次保存时重新获取
+        """
+        pool = self._write_pool
+        if pool is None and self.config.write_workers > 0:
+            with self._write_pool_lock:
+                if self._write_pool is None:
+                    self._write_pool_key, self._write_pool = _acquire_write_pool(
+                        self.config.save_path, self.config.write_workers
+                    )
+                pool = self._write_pool
+        return pool
+    
+    def _on_write_done(self, future):
+        """写盘任务完成回调：释放写入名额"""
+        self._pending_writes.discard(future)
+        self._write_slots.release()
+    
+    def _write_image(self, filepath, filename, image):
+        """编码并写入图像"""
+        try:
+            if self._direct_io:
+                self._write_direct(filepath, image)
             else:
-                cv2.imwrite(filepath, packet.processed_image)
+                cv2.imwrite(filepath, image, self._imwrite_params)
+            
+            logger.debug("保存图像: %s", filename)
             
-            logger.debug(f"保存图像: {filename}")
+            if self._limit_saved_images:
+                with self._index_lock:
+                    self._record_saved_image(filename)
             
         except Exception as e:
-            logger.exception(f"保存图像异常: {e}")
+            logger.exception("保存图像异常: %s", e)
+    
+    def _write_direct(self, filepath, image):
+        """
+        以O_DIRECT方式写入图像，绕过页缓存
+        编码结果复制到按页对齐的匿名映射中，补齐到块大小写入后再截断到实际长度
+        """
+        ok, encoded = cv2.imencode(self._save_suffix, image, self._imwrite_params)
+        if not ok:
+            raise IOError(f"图像编码失败: {filepath}")
+        
+        size = encoded.nbytes
+        padded = -(-size // _DIRECT_IO_ALIGN) * _DIRECT_IO_ALIGN
+        buf = getattr(self._direct_local, 'buf', None)
+        if buf is None or len(buf) < padded:
+            if buf is not None:
+                buf.close()
+            buf = self._direct_local.buf = mmap.mmap(-1, padded)
+        
+        try:
+            fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_DIRECT, 0o644)
+        except OSError as e:
+            if e.errno != errno.EINVAL:
+                raise
+            # 文件系统不支持O_DIRECT（如tmpfs），回退到普通写入
+            logger.warning("保存目录不支持O_DIRECT，使用普通方式写入图像")
+            self._direct_io = False
+            cv2.imwrite(filepath, image, self._imwrite_params)
+            return
+        
+        try:
+            with memoryview(buf) as view:
+                view[:size] = encoded.reshape(-1)
+                written = os.write(fd, view[:padded])
+            if written != padded:
+                # 写入不完整（如磁盘已满、超出配额），截断会用0补齐而保存出损坏的图像，删除残缺文件
+                os.unlink(filepath)
+                raise OSError(errno.ENOSPC, f"图像写入不完整 ({written}/{padded} 字节)", filepath)
+            os.ftruncate(fd, size)
+        finally:
+            os.close(fd)
+    
+    def _load_index(self):
+        """
+        从索引日志恢复已保存图像列表
+        顺序读取一个小文件，避免重启时逐个stat整个保存目录；
+        索引日志不存在时（首次启用数量上限）扫描一次保存目录建立索引
+        """
+        try:
+            try:
+                with open(self._index_path, 'rb') as f:
+                    data = f.read()
+            except FileNotFoundError:
+                self._seed_index()
+                data = b''
+            
+            offset = 0
+            while offset + _INDEX_ENTRY.size <= len(data):
+                mtime_ns, name_len = _INDEX_ENTRY.unpack_from(data, offset)
+                offset += _INDEX_ENTRY.size
+                if offset + name_len > len(data):
+                    break  # 末尾记录不完整（写入中断），丢弃
+                name = data[offset:offset + name_len].decode('utf-8')
+                offset += name_len
+                
+                if mtime_ns:
+                    self._saved_images[name] = mtime_ns
+                else:
+                    self._saved_images.pop(name, None)
+                    self._index_tombstones += 1
+            
+            if data:
+                logger.info("加载图像索引: %d 个文件", len(self._saved_images))
+            
+            # 以当前内容重写索引，顺带清理删除标记和不完整记录
+            self._compact_index()
+            
+        except Exception as e:
+            # 索引不可用时无法可靠地淘汰旧图像，关闭数量上限
+            logger.exception("加载图像索引异常，已禁用图像数量上限: %s", e)
+            self._limit_saved_images = False
+            self._saved_images.clear()
+            if self._index_file is not None:
+                self._index_file.close()
+                self._index_file = None
+    
+    def _seed_index(self):
+        """扫描保存目录，将已有图像按修改时间（最旧的在前）加入索引"""
+        existing = []
+        with os.scandir(self.config.save_path) as entries:
+            for entry in entries:
+                name = entry.name
+                if (name.startswith("frame_") and name.endswith(self._save_suffix)
+                        and entry.is_file(follow_symlinks=False)):
+                    existing.append((entry.stat().st_mtime_ns, name))
+        
+        existing.sort()
+        for mtime_ns, name in existing:
+            self._saved_images[name] = mtime_ns
+        
+        if existing:
+            logger.info("扫描保存目录建立图像索引: %d 个文件", len(existing))
+    
+    def _append_index(self, mtime_ns, name):
+        """追加一条索引记录"""
+        encoded = name.encode('utf-8')
+        self._index_file.write(_INDEX_ENTRY.pack(mtime_ns, len(encoded)) + encoded)
+    
+    def _compact_index(self):
+        """压缩索引日志，只保留现存文件的记录"""
+        if self._index_file is not None:
+            self._index_file.close()
+        
+        tmp_path = self._index_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            for name, mtime_ns in self._saved_images.items():
+                encoded = name.encode('utf-8')
+                f.write(_INDEX_ENTRY.pack(mtime_ns, len(encoded)) + encoded)
+        os.replace(tmp_path, self._index_path)
+        
+        self._index_tombstones = 0
+        self._index_file = open(self._index_path, 'ab', buffering=0)
+    
+    def _record_saved_image(self, filename):
+        """记录新保存的图像，超出数量上限时删除最旧的图像"""
+        if self._index_file is None:
+            # close()后管道重新启动，重新打开索引日志继续追加
+            self._index_file = open(self._index_path, 'ab', buffering=0)
+        
+        mtime_ns = time.time_ns()
+        self._saved_images[filename] = mtime_ns
+        self._append_index(mtime_ns, filename)
+        
+        while len(self._saved_images) > self.config.max_saved_images:
+            old_name, _ = self._saved_images.popitem(last=False)
+            try:
+                os.unlink(os.path.join(self.config.save_path, old_name))
+            except FileNotFoundError:
+                pass  # 已被外部删除
+            self._append_index(0, old_name)
+            self._index_tombstones += 1
+        
+        # 删除标记超过现存记录的25%时压缩
+        if self._index_tombstones > max(len(self._saved_images) // 4, 64):
+            self._compact_index()
     
     def _save_detection(self, packet: DataPacket):
         """保存检测结果"""
@@ -110,35 +405,74 @@ class StorageService(Filter):
                 self._flush_detection_log()
             
         except Exception as e:
-            logger.exception(f"保存检测结果异常: {e}")
+            logger.exception("保存检测结果异常: %s", e)
     
     def _flush_detection_log(self):
-        """刷新检测日志到文件"""
+        """
+        刷新检测日志到文件
+        在现有JSON数组末尾原地追加新记录，不再读取并重写整个文件
+        """
         try:
             if not self.detection_log:
                 return
             
-            # 读取现有数据
-            existing_data = []
-            if os.path.exists(self.config.detection_log_path):
-                with open(self.config.detection_log_path, 'r', encoding='utf-8') as f:
-                    existing_data = json.load(f)
-            
-            # 追加新数据
-            existing_data.extend(self.detection_log)
+            # 按 json.dump(indent=2) 的数组格式序列化新记录
+            entries = ",\n  ".join(
+                json.dumps(entry, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+                for entry in self.detection_log
+            ).encode('utf-8')
             
-            # 保存
-            with open(self.config.detection_log_path, 'w', encoding='utf-8') as f:
-                json.dump(existing_data, f, indent=2, ensure_ascii=False)
+            try:
+                f = open(self.config.detection_log_path, 'r+b')
+            except FileNotFoundError:
+                with open(self.config.detection_log_path, 'wb') as f:
+                    f.write(b"[\n  " + entries + b"\n]")
+            else:
+                with f:
+                    # 定位数组结尾的 ']'，从最后一条记录之后覆盖写入
+                    end = f.seek(0, os.SEEK_END)
+                    tail_start = max(0, end - 64)
+                    f.seek(tail_start)
+                    tail = f.read().rstrip()
+                    if not tail.endswith(b"]"):
+                        raise ValueError(f"检测日志格式错误: {self.config.detection_log_path}")
+                    
+                    body = tail[:-1].rstrip()
+                    separator = b"\n  " if body.endswith(b"[") else b",\n  "
+                    f.seek(tail_start + len(body))
+                    f.write(separator + entries + b"\n]")
+                    f.truncate()
             
-            logger.info(f"保存 {len(self.detection_log)} 条检测记录")
+            logger.info("保存 %d 条检测记录", len(self.detection_log))
             self.detection_log = []
             
         except Exception as e:
-            logger.exception(f"刷新检测日志异常: {e}")
+            logger.exception("刷新检测日志异常: %s", e)
     
-    def __del__(self):
-        """析构函数"""
+    def close(self, wait_writes=True):
+        """
+        释放线程池并保存剩余的检测记录（管道停止时调用）
+        关闭后仍可继续使用，再次保存时重新获取线程池并打开索引日志
+        
+        Args:
+            wait_writes: 是否等待未完成的写盘任务
+        """
+        with self._write_pool_lock:
+            released, self._write_pool = self._write_pool, None
+        if released is not None:
+            if wait_writes:
+                wait(list(self._pending_writes))
+            _release_write_pool(self._write_pool_key, wait=wait_writes)
+        
         # 保存剩余的检测记录
         if self.detection_log:
             self._flush_detection_log()
+        
+        with self._index_lock:
+            if self._index_file is not None:
+                self._index_file.close()
+                self._index_file = None
+    
+    def __del__(self):
+        """析构函数（可能在写盘线程中触发，不能等待线程池）"""
+        self.close(wait_writes=False)
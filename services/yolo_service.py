@@ -25,6 +25,7 @@ class YOLOService(Filter):
         super().__init__("YOLOService", config)
         
         self.model = None
+        self._predict = None  # ultralytics模型的predict方法，加载时解析一次
         self._load_model()
     
     def _load_model(self):
@@ -34,6 +35,7 @@ class YOLOService(Filter):
             try:
                 from ultralytics import YOLO
                 self.model = YOLO(self.config.model_path)
+                self._predict = self.model.predict
                 logger.info(f"YOLOv8模型加载成功: {self.config.model_path}")
                 return
             except ImportError:
@@ -72,8 +74,8 @@ class YOLOService(Filter):
             image = packet.processed_image
             
             # 使用ultralytics YOLO
-            if hasattr(self.model, 'predict'):
-                results = self.model.predict(
+            if self._predict is not None:
+                results = self._predict(
                     image,
                     conf=self.config.confidence_threshold,
                     iou=self.config.iou_threshold,
@@ -69,20 +69,20 @@ print("\n" + "=" * 60)
 print("测试总结")
 print("=" * 60)
 
-success_count = sum(1 for _, success, _ in results if success)
+failed = [(name, msg) for name, success, msg in results if not success]
 total_count = len(results)
+success_count = total_count - len(failed)
 
 print(f"总计: {total_count} 个模块")
 print(f"成功: {success_count} 个")
-print(f"失败: {total_count - success_count} 个")
+print(f"失败: {len(failed)} 个")
 
-if success_count == total_count:
+if not failed:
     print("\n✓ 所有模块导入成功！service_new 目录完全独立，无父目录依赖。")
 else:
     print("\n✗ 部分模块导入失败，请检查错误信息。")
     print("\n失败的模块:")
-    for name, success, msg in results:
-        if not success:
-            print(f"  - {name}: {msg}")
+    for name, msg in failed:
+        print(f"  - {name}: {msg}")
 
 print("=" * 60)